@@ -4,6 +4,7 @@ import petab.C as ptc
 import pyqtgraph as pg
 
 from . import bar_row, C
+from . import utils
 from . import plot_class
 
 
@@ -20,6 +21,8 @@ class BarPlot(plot_class.PlotClass):
 
      Attributes:
          bar_rows: A list of BarRows (one for each visualization df row)
+         bar_dfs: The data dfs of the bar_rows (computed once, such that
+             toggling a bar only has to concatenate them again)
          overview_df: A df containing the information of each bar
      """
 
@@ -35,12 +38,13 @@ class BarPlot(plot_class.PlotClass):
         # bar_rows also contains simulation bars
         self.bar_rows = []
         self.add_bar_rows(self.measurement_df)  # list of plot_rows
-        self.add_bar_rows(self.simulation_df)
+        self.add_bar_rows(self.simulation_df, is_simulation=True)
+        self.bar_dfs = [bar.get_data_df() for bar in self.bar_rows]
 
         # A df containing the information needed to plot the bars
-        self.overview_df = pd.DataFrame(
-            columns=[C.X, C.Y, C.NAME, C.SD, C.SEM, C.PROVIDED_NOISE,
-                     C.IS_SIMULATION, C.TICK_POS])
+        self.overview_df = utils.empty_overview_df(
+            [C.X, C.Y, C.NAME, C.SD, C.SEM, C.PROVIDED_NOISE,
+             C.IS_SIMULATION, C.TICK_POS])
 
         self.plot_everything()
 
@@ -58,18 +62,24 @@ class BarPlot(plot_class.PlotClass):
             # create correlation plot
             self.generate_correlation_plot(self.overview_df)
 
-    def add_bar_rows(self, df):
+    def add_bar_rows(self, df, is_simulation: bool = False):
         """
         Add a BarRow object for each row of the visualization df.
 
         Arguments:
             df: Measurement or Simulation df
+            is_simulation: True if df is a simulation df
         """
-        if self.visualization_df is not None:
-            for _, plot_spec in self.visualization_df.iterrows():
-                if df is not None:
-                    row = bar_row.BarRow(df, plot_spec, self.condition_df)
-                    self.bar_rows.append(row)
+        # without a df (e.g. no simulation file) there is nothing to add
+        if self.visualization_df is not None and df is not None:
+            # reduce the condition df only once for all rows of the plot
+            condition_df = self.get_plot_condition_df(df)
+            condition_positions = utils.get_condition_positions(condition_df)
+            for plot_spec in self.visualization_df.itertuples(
+                    index=False):
+                row = bar_row.BarRow(df, plot_spec, condition_df,
+                                     is_simulation, condition_positions)
+                self.bar_rows.append(row)
 
     def generate_overview_df(self):
         """
@@ -80,12 +90,10 @@ class BarPlot(plot_class.PlotClass):
         Returns:
             overview_df: A dataframe containing an overview of the plotRows
         """
-        overview_df = pd.DataFrame(
-            columns=[C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID,
-                     C.SD, C.SEM])
+        overview_df = utils.empty_overview_df(
+            [C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID, C.SD, C.SEM])
         if self.visualization_df is not None:
-            dfs = [bar.get_data_df() for bar in
-                   self.bar_rows
+            dfs = [bar_df for bar, bar_df in zip(self.bar_rows, self.bar_dfs)
                    if bar.dataset_id not in self.disabled_rows]
             if dfs:
                 overview_df = pd.concat(dfs, ignore_index=True)
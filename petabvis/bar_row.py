@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
 
@@ -18,8 +20,11 @@ class BarRow(row_class.RowClass):
     """
 
     def __init__(self, exp_data: pd.DataFrame,
-                 plot_spec: pd.Series, condition_df: pd.DataFrame, ):
-        super().__init__(exp_data, plot_spec, condition_df)
+                 plot_spec: NamedTuple, condition_df: pd.DataFrame,
+                 is_simulation: bool = False,
+                 condition_positions: dict = None):
+        super().__init__(exp_data, plot_spec, condition_df, is_simulation,
+                         condition_positions)
 
         # Note: A bar plot has no x_data
         self.y_data = self.get_mean_y_data()
@@ -162,8 +162,7 @@ class DottedLine:
             error_length = self.p_row.provided_noise
         beam_width = 0
         if len(self.p_row.x_data) > 0:  # self.p_row.x_data could be empty
-            beam_width = (np.max(self.p_row.x_data) -
-                          np.min(self.p_row.x_data)) / 100
+            beam_width = np.ptp(self.p_row.x_data) / 100
         error = pg.ErrorBarItem(x=self.p_row.x_data, y=self.p_row.y_data,
                                 top=error_length, bottom=error_length,
                                 beam=beam_width)
@@ -227,12 +226,12 @@ class DottedLine:
         """
         self.color = new_color
         self.pen = pg.mkPen(self.color)
+        # one pen and brush shared by all lines
+        line_pen = self.get_line_pen()
+        symbol_brush = pg.mkBrush(self.color)
         for line in self.lines:
-            # when fill_between items are present, the color
-            # of the line should stay black to be visible
-            new_color = self.get_line_color()
-            line.setPen(new_color, style=self.style, width=self.line_width)
-            line.setSymbolBrush(self.color)
+            line.setPen(line_pen)
+            line.setSymbolBrush(symbol_brush)
         for error_bars in self.error_bars:
             error_bars.setData(pen=self.pen)
         for fill in self.fill_between_items:
@@ -293,17 +292,19 @@ class DottedLine:
         """
         for fill in self.fill_between_items:
             fill.setBrush(self.color)
-        color = self.get_line_color()
+        line_pen = self.get_line_pen()
         for line in self.lines:
-            line.setPen(color, style=self.style, width=self.line_width)
+            line.setPen(line_pen)
 
     def show_points(self):
         """
         Show all points.
         """
+        symbol_brush = pg.mkBrush(self.color)
+        symbol_pen = pg.mkPen("k")
         for line in self.lines:
-            line.setSymbolBrush(self.color)
-            line.setSymbolPen("k")
+            line.setSymbolBrush(symbol_brush)
+            line.setSymbolPen(symbol_pen)
 
     def show_errors(self):
         """
@@ -317,18 +318,20 @@ class DottedLine:
         Set the width of the lines.
         """
         self.line_width = width
-        color = self.get_line_color()
+        line_pen = self.get_line_pen()
         for line in self.lines:
-            line.setPen(color, style=self.style, width=self.line_width)
+            line.setPen(line_pen)
 
     def set_point_size(self, size):
         """
         Set the size of the points
         """
         self.symbol_size = size
+        line_pen = pg.mkPen(self.color, style=self.style,
+                            width=self.line_width)
         for line in self.lines:
             line.opts["symbolSize"] = size
-            line.setPen(self.color, style=self.style, width=self.line_width)
+            line.setPen(line_pen)
 
     def get_line_color(self):
         """
@@ -341,3 +344,14 @@ class DottedLine:
         if self.fill_between_items:
             return "k"
         return self.color
+
+    def get_line_pen(self):
+        """
+        Create the pen for the lines based on the line color,
+        the style and the line width.
+
+        Returns:
+            The pen of the lines.
+        """
+        return pg.mkPen(self.get_line_color(), style=self.style,
+                        width=self.line_width)
@@ -1,14 +1,16 @@
 import argparse
+import contextlib
 import sys  # We need sys so that we can pass argv to QApplication
 import os
 import warnings
 
+import numpy as np
 import pandas as pd
 import petab.C as ptc
 import pyqtgraph as pg
 from PySide6 import QtWidgets, QtCore, QtGui
 from PySide6.QtWidgets import (
-    QVBoxLayout, QComboBox, QWidget, QLabel, QTreeView
+    QVBoxLayout, QComboBox, QWidget, QLabel, QTreeView, QStackedWidget
 )
 from petab import core
 import petab
@@ -19,6 +21,11 @@ from .bar_plot import BarPlot
 from .options_window import (OptionMenu, CorrelationOptionMenu,
                              OverviewPlotWindow)
 
+# set the background color to white
+pg.setConfigOption('background', 'w')
+pg.setConfigOption('foreground', 'k')
+pg.setConfigOption("antialias", True)
+
 
 class MainWindow(QtWidgets.QMainWindow):
     """
@@ -30,12 +37,21 @@ class MainWindow(QtWidgets.QMainWindow):
         yaml_dict: Dictionary of the files in the yaml file
         condition_df: PEtab condition table
         observable_df: PEtab observable table
-        plot1_widget: pg.GraphicsLayoutWidget containing the main plot
-        plot2_widget: pg.GraphicsLayoutWidget containing the correlation plot
+        plot1_widget: QStackedWidget with a pg.GraphicsLayoutWidget
+            for the main plot of each VisuSpecPlot
+        plot2_widget: QStackedWidget with a pg.GraphicsLayoutWidget
+            for the correlation plot of each VisuSpecPlot
         warn_msg: QLabel displaying current warning messages
         popup_tables: List of Popup TableWidget displaying the clicked table
         tree_view: QTreeView of the yaml file
-        visu_spec_plots: A list of VisuSpecPlots
+        visu_spec_plots: A list of VisuSpecPlots (None for plots that
+            have not been displayed yet)
+        plot_ids: The plotIds of the plots in the plot selection
+            (observableIds for default plots)
+        plot_positions: Dictionary mapping the plot_ids to their
+            index in the plot selection
+        plot_vis_dfs: The rows of the visualization df of each plot
+            (None for default plots)
         cbox: A dropdown menu for the plots
         current_list_index: List index of the currently displayed plot
         wid: QSplitter between main plot and correlation plot
@@ -45,10 +61,6 @@ class MainWindow(QtWidgets.QMainWindow):
                  simulation_file: pd.DataFrame = None, *args, **kwargs):
 
         super(MainWindow, self).__init__(*args, **kwargs)
-        # set the background color to white
-        pg.setConfigOption('background', 'w')
-        pg.setConfigOption('foreground', 'k')
-        pg.setConfigOption("antialias", True)
         self.resize(1000, 600)
         self.setWindowTitle("petabvis")
         self.visualization_df = None
@@ -61,9 +73,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.color_map = utils.generate_color_map("viridis")
         self.vis_spec_plots = []
+        self.plot_ids = []
+        self.plot_positions = {}
+        self.plot_vis_dfs = []
         self.wid = QtWidgets.QSplitter()
-        self.plot1_widget = pg.GraphicsLayoutWidget(show=True)
-        self.plot2_widget = pg.GraphicsLayoutWidget(show=False)
+        # every plot gets its own page in the stacked widgets, such that
+        # switching plots does not require rebuilding the scene
+        self.plot1_widget = QStackedWidget()
+        self.plot2_widget = QStackedWidget()
         self.overview_plot_window = None
         self.wid.addWidget(self.plot1_widget)
         # plot2_widget will be added to the QSplitter when
@@ -88,8 +105,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.wid.addWidget(self.tree_view)
         self.current_list_index = 0
 
-        warnings.showwarning = self.redirect_warning
-
         window_functionality.add_file_selector(self)
         window_functionality.add_option_menu(self)
 
@@ -119,17 +134,19 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.add_plots()
 
     def read_data_from_yaml_file(self):
-        self.yaml_dict = petab.load_yaml(self.yaml_filename)["problems"][0]
-        folder_path = os.path.dirname(self.yaml_filename) + "/"
-        if ptc.VISUALIZATION_FILES not in self.yaml_dict:
-            self.visualization_df = None
-            self.add_warning(
-                "The YAML file contains no "
-                "visualization file (default plotted)")
-        # table_tree_view sets the df attributes of the window
-        # equal to the first file of each branch
-        # (measurement, visualization, ...)
-        window_functionality.table_tree_view(self, folder_path)
+        with self.redirect_warnings():
+            self.yaml_dict = petab.load_yaml(
+                self.yaml_filename)["problems"][0]
+            folder_path = os.path.dirname(self.yaml_filename) + "/"
+            if ptc.VISUALIZATION_FILES not in self.yaml_dict:
+                self.visualization_df = None
+                self.add_warning(
+                    "The YAML file contains no "
+                    "visualization file (default plotted)")
+            # table_tree_view sets the df attributes of the window
+            # equal to the first file of each branch
+            # (measurement, visualization, ...)
+            window_functionality.table_tree_view(self, folder_path)
 
     def add_and_plot_simulation_file(self, filename):
         """
@@ -141,11 +158,12 @@ class MainWindow(QtWidgets.QMainWindow):
             filename: Path of the simulation file.
         """
 
-        sim_data = core.get_simulation_df(filename)
-        # check columns, and add non-mandatory default columns
-        sim_data, _, _ = check_ex_exp_columns(
-            sim_data, None, None, None, None, None,
-            self.condition_df, sim=True)
+        with self.redirect_warnings():
+            sim_data = core.get_simulation_df(filename)
+            # check columns, and add non-mandatory default columns
+            sim_data, _, _ = check_ex_exp_columns(
+                sim_data, None, None, None, None, None,
+                self.condition_df, sim=True)
         # delete the replicateId column if it gets added to the simulation
         # table but is not in exp_data because it causes problems when
         # splitting the replicates
@@ -173,37 +191,80 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def add_plots(self):
         """
-        Adds the current visuSpecPlots to the main window,
-        removes the old ones and updates the
-        cbox (dropdown list)
+        Removes the old visuSpecPlots, collects the plots that
+        can be displayed and updates the cbox (dropdown list).
+
+        The plots themselves are only created when they are
+        displayed for the first time (see get_vis_spec_plot).
+        """
+        # warnings of the plot selection (e.g. plot names) are shown
+        # in the window as well
+        with self.redirect_warnings():
+            # defer repaints and index changes until all pages are added
+            self.plot1_widget.setUpdatesEnabled(False)
+            self.plot2_widget.setUpdatesEnabled(False)
+            self.cbox.blockSignals(True)
+            try:
+                self.clear_qsplitter()
+                self.vis_spec_plots.clear()
+                self.plot_ids.clear()
+                self.plot_vis_dfs.clear()
+                self.options_window.reset_states()
+
+                if self.visualization_df is not None:
+                    # sort=False to keep the order of plots consistent
+                    # with names from the plot selection
+                    for plot_id, vis_df in self.visualization_df.groupby(
+                            ptc.PLOT_ID, sort=False):
+                        self.plot_ids.append(plot_id)
+                        self.plot_vis_dfs.append(vis_df)
+                else:  # default plots (one per observable) without a visu_df
+                    observable_ids = self.exp_data[ptc.OBSERVABLE_ID].unique()
+                    for observable_id in observable_ids:
+                        self.plot_ids.append(observable_id)
+                        self.plot_vis_dfs.append(None)
+
+                self.plot_positions = {plot_id: i for i, plot_id
+                                       in enumerate(self.plot_ids)}
+                for _ in self.plot_ids:
+                    self.vis_spec_plots.append(None)
+                    # placeholder pages, replaced once the plot is created
+                    self.plot1_widget.addWidget(QWidget())
+                    self.plot2_widget.addWidget(QWidget())
+
+                # update the cbox
+                self.cbox.clear()
+                # calling this method sets the index of the cbox to 0
+                utils.add_plotnames_to_cbox(self.exp_data,
+                                            self.visualization_df, self.cbox)
+            finally:
+                self.cbox.blockSignals(False)
+                self.plot1_widget.setUpdatesEnabled(True)
+                self.plot2_widget.setUpdatesEnabled(True)
+            # display the first plot
+            self.index_changed(self.cbox.currentIndex())
+
+    def get_vis_spec_plot(self, i: int):
+        """
+        Return the plot at index i of the plot selection.
+        The plot is created when it is requested for the first time.
+
+        Arguments:
+            i: index of the plot
 
         Returns:
-            List of PlotItem
+            The VisSpecPlot or BarPlot
         """
-        self.clear_qsplitter()
-        self.vis_spec_plots.clear()
-        self.options_window.reset_states()
-
-        if self.visualization_df is not None:
-            # to keep the order of plots consistent
-            # with names from the plot selection
-            plot_ids = list(self.visualization_df[ptc.PLOT_ID].unique())
-            for plot_id in plot_ids:
-                self.create_and_add_vis_plot(plot_id)
-        else:  # default plot when no visu_df is provided
-            self.create_and_add_vis_plot()
-
-        plots = [vis_spec_plot.get_plot() for vis_spec_plot in
-                 self.vis_spec_plots]
-
-        # update the cbox
-        self.cbox.clear()
-        # calling this method sets the index of the cbox to 0
-        # and thus displays the first plot
-        utils.add_plotnames_to_cbox(self.exp_data, self.visualization_df,
-                                    self.cbox)
-
-        return plots
+        if self.vis_spec_plots[i] is None:
+            with self.redirect_warnings():
+                plot = self.create_vis_plot(self.plot_ids[i],
+                                            self.plot_vis_dfs[i])
+            self.vis_spec_plots[i] = plot
+            self.add_plot_pages(i, plot)
+            # the plot should look like the plots created earlier
+            self.options_window.apply_states(plot)
+            self.correlation_options_window.apply_states(plot)
+        return self.vis_spec_plots[i]
 
     def index_changed(self, i: int):
         """
@@ -214,14 +275,16 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         if 0 <= i < len(
                 self.vis_spec_plots):  # i is -1 when the cbox is cleared
-            self.clear_qsplitter()
-            self.plot1_widget.addItem(self.vis_spec_plots[i].get_plot())
+            self.get_vis_spec_plot(i)
+            self.plot1_widget.setCurrentIndex(i)
             self.plot2_widget.hide()
             if self.simulation_df is not None:
                 self.plot2_widget.show()
-                self.plot2_widget.addItem(
-                    self.vis_spec_plots[i].correlation_plot)
+                self.plot2_widget.setCurrentIndex(i)
             self.current_list_index = i
+            # only the highlighted rows of the open tables change
+            for popup_table in self.popup_tables:
+                popup_table.model.set_current_plot(self.vis_spec_plots[i])
 
     def keyPressEvent(self, ev):
         """
@@ -256,7 +319,9 @@ class MainWindow(QtWidgets.QMainWindow):
         Arguments:
             message: The message to display
         """
-        if message not in self.warnings:
+        # the counter dict is used for the lookup since
+        # it is faster than searching the list of warnings
+        if message not in self.warning_counter:
             self.warnings.append(message)
             self.warning_counter[message] = 1
         else:
@@ -284,75 +349,118 @@ class MainWindow(QtWidgets.QMainWindow):
         Arguments:
             message: The message of the warning
         """
-        print("Warning redirected: " + str(message))
         self.add_warning(str(message))
 
-    def create_and_add_vis_plot(self, plot_id=""):
+    @contextlib.contextmanager
+    def redirect_warnings(self):
+        """
+        Context manager that records the warnings raised inside
+        of it and displays them in the window.
+        The global warning handler is only replaced within the
+        context and restored afterwards.
+        """
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            # the input warnings should be shown every time, library
+            # deprecation warnings keep their default filters
+            warnings.simplefilter("always", UserWarning)
+            try:
+                yield
+            finally:
+                for warning in caught_warnings:
+                    self.redirect_warning(warning.message, warning.category,
+                                          warning.filename, warning.lineno)
+
+    def create_vis_plot(self, plot_id="", vis_df=None):
         """
         Create a vis_spec_plot object based on the given plot_id.
-        If no plot_it is provided the default will be plotted.
+        If no vis_df is provided the default plot of the
+        observable plot_id will be created.
         Add all the warnings of the vis_plot object to the warning text box.
 
         The actual plotting happens in the index_changed method
 
         Arguments:
             plot_id: The plotId of the plot
+                (or the observableId for default plots)
+            vis_df: The rows of the visualization df with this plotId
+
+        Returns:
+            The VisSpecPlot or BarPlot
         """
         # split the measurement df by observable when using default plots
-        if self.visualization_df is None:
-            observable_ids = list(self.exp_data[ptc.OBSERVABLE_ID].unique())
-            for observable_id in observable_ids:
-                rows = self.exp_data[ptc.OBSERVABLE_ID] == observable_id
-                data = self.exp_data[rows]
-                simulation_df = self.simulation_df
-                if simulation_df is not None:
-                    rows = self.simulation_df[ptc.OBSERVABLE_ID]\
-                           == observable_id
-                    simulation_df = self.simulation_df[rows]
-                vis_plot = vis_spec_plot.VisSpecPlot(
-                    measurement_df=data, visualization_df=None,
-                    condition_df=self.condition_df,
-                    simulation_df=simulation_df, plot_id=observable_id,
-                    color_map=self.color_map)
-                self.vis_spec_plots.append(vis_plot)
-                if vis_plot.warnings:
-                    self.add_warning(vis_plot.warnings)
-        else:
-            # reduce the visualization df to the relevant rows (by plotId)
-            rows = self.visualization_df[ptc.PLOT_ID] == plot_id
-            vis_df = self.visualization_df[rows]
-            if ptc.PLOT_TYPE_SIMULATION in vis_df.columns and \
-                    vis_df.iloc[0][ptc.PLOT_TYPE_SIMULATION] == ptc.BAR_PLOT:
-                bar_plot = BarPlot(measurement_df=self.exp_data,
-                                   visualization_df=vis_df,
-                                   condition_df=self.condition_df,
-                                   simulation_df=self.simulation_df,
-                                   plot_id=plot_id)
-                # might want to change the name of
-                # visu_spec_plots to clarify that
-                # it can also include bar plots (maybe to plots?)
-                self.vis_spec_plots.append(bar_plot)
-            else:
-                vis_plot = vis_spec_plot.VisSpecPlot(
-                    measurement_df=self.exp_data,
-                    visualization_df=vis_df,
-                    condition_df=self.condition_df,
-                    simulation_df=self.simulation_df, plot_id=plot_id,
-                    color_map=self.color_map)
-                self.vis_spec_plots.append(vis_plot)
-                if vis_plot.warnings:
-                    self.add_warning(vis_plot.warnings)
+        if vis_df is None:
+            observable_id = plot_id
+            rows = self.exp_data[ptc.OBSERVABLE_ID].to_numpy()\
+                == observable_id
+            data = self.exp_data.iloc[np.flatnonzero(rows)]
+            simulation_df = self.simulation_df
+            if simulation_df is not None:
+                rows = self.simulation_df[ptc.OBSERVABLE_ID].to_numpy()\
+                       == observable_id
+                simulation_df = self.simulation_df.iloc[np.flatnonzero(rows)]
+            vis_plot = vis_spec_plot.VisSpecPlot(
+                measurement_df=data, visualization_df=None,
+                condition_df=self.condition_df,
+                simulation_df=simulation_df, plot_id=observable_id,
+                color_map=self.color_map)
+            if vis_plot.warnings:
+                self.add_warning(vis_plot.warnings)
+            return vis_plot
+
+        if ptc.PLOT_TYPE_SIMULATION in vis_df.columns and \
+                vis_df[ptc.PLOT_TYPE_SIMULATION].iat[0] == ptc.BAR_PLOT:
+            # might want to change the name of
+            # visu_spec_plots to clarify that
+            # it can also include bar plots (maybe to plots?)
+            return BarPlot(measurement_df=self.exp_data,
+                           visualization_df=vis_df,
+                           condition_df=self.condition_df,
+                           simulation_df=self.simulation_df,
+                           plot_id=plot_id)
+
+        vis_plot = vis_spec_plot.VisSpecPlot(
+            measurement_df=self.exp_data,
+            visualization_df=vis_df,
+            condition_df=self.condition_df,
+            simulation_df=self.simulation_df, plot_id=plot_id,
+            color_map=self.color_map)
+        if vis_plot.warnings:
+            self.add_warning(vis_plot.warnings)
+        return vis_plot
+
+    def add_plot_pages(self, i: int, plot):
+        """
+        Replace the placeholder pages at index i of the stacked plot
+        widgets with the main plot and the correlation plot of `plot`.
+
+        Arguments:
+            i: index of the plot
+            plot: A VisSpecPlot or BarPlot
+        """
+        plot_widget = pg.GraphicsLayoutWidget()
+        plot_widget.addItem(plot.get_plot())
+        correlation_widget = pg.GraphicsLayoutWidget()
+        correlation_widget.addItem(plot.correlation_plot)
+        for stacked_widget, page in [(self.plot1_widget, plot_widget),
+                                     (self.plot2_widget, correlation_widget)]:
+            placeholder = stacked_widget.widget(i)
+            stacked_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+            stacked_widget.insertWidget(i, page)
 
     def clear_qsplitter(self):
         """
-        Clear the GraphicsLayoutWidgets for the
+        Remove all pages of the stacked widgets for the
         measurement and correlation plot
         """
-        self.plot1_widget.clear()
-        self.plot2_widget.clear()
+        for stacked_widget in [self.plot1_widget, self.plot2_widget]:
+            while stacked_widget.count() > 0:
+                page = stacked_widget.widget(0)
+                stacked_widget.removeWidget(page)
+                page.deleteLater()
 
     def add_overview_plot_window(self):
-        self.overview_plot_window = OverviewPlotWindow(self.exp_data,
+        self.overview_plot_window = OverviewPlotWindow(self, self.exp_data,
                                                        self.simulation_df)
 
 
@@ -362,8 +470,15 @@ def main():
                          help="PEtab YAML file", default=None)
     options.add_argument("-s", "--simulation", type=str, required=False,
                          help="PEtab simulation file", default=None)
+    options.add_argument("--opengl", action="store_true",
+                         help="Draw the plots with OpenGL (faster for "
+                              "large datasets, requires OpenGL support)")
     args = options.parse_args()
 
+    if args.opengl:
+        # has to be set before the plot widgets are created
+        pg.setConfigOption("useOpenGL", True)
+
     simulation_file = None
     if args.simulation is not None:
         simulation_file = args.simulation
@@ -87,28 +87,28 @@ class OptionMenu(QMainWindow):
         Add a box for specifying the width of the lines and
         add a description for the box to the layout.
         """
-        line_width_box = QDoubleSpinBox()
-        line_width_box.setObjectName("line_width_box")
-        line_width_box.setValue(C.LINE_WIDTH)
-        line_width_box.valueChanged.connect(
-            lambda x: self.value_changed(line_width_box))
+        self.line_width_box = QDoubleSpinBox()
+        self.line_width_box.setObjectName("line_width_box")
+        self.line_width_box.setValue(C.LINE_WIDTH)
+        self.line_width_box.valueChanged.connect(
+            lambda x: self.value_changed(self.line_width_box))
         line_width_text = QLabel("Line width: ")
         self.layout.addWidget(line_width_text)
-        self.layout.addWidget(line_width_box)
+        self.layout.addWidget(self.line_width_box)
 
     def add_point_size_box(self):
         """
         Add a box for specifying the size of the points and
         add a description for the box to the layout.
         """
-        point_size_box = QDoubleSpinBox()
-        point_size_box.setObjectName("point_size_box")
-        point_size_box.setValue(C.POINT_SIZE)
-        point_size_box.valueChanged.connect(
-            lambda x: self.value_changed(point_size_box))
+        self.point_size_box = QDoubleSpinBox()
+        self.point_size_box.setObjectName("point_size_box")
+        self.point_size_box.setValue(C.POINT_SIZE)
+        self.point_size_box.valueChanged.connect(
+            lambda x: self.value_changed(self.point_size_box))
         point_size_text = QLabel("Point size: ")
         self.layout.addWidget(point_size_text)
-        self.layout.addWidget(point_size_box)
+        self.layout.addWidget(self.point_size_box)
 
     def add_save_option(self):
         """
@@ -191,6 +191,29 @@ class OptionMenu(QMainWindow):
         self.point_box.setCheckState(Qt.Checked)
         self.error_box.setCheckState(Qt.Checked)
 
+    def apply_states(self, plot):
+        """
+        Apply the current options to a newly created plot.
+
+        Arguments:
+            plot: A VisSpecPlot or BarPlot
+        """
+        if not isinstance(plot, VisSpecPlot):
+            return
+        line_width = self.line_width_box.value()
+        point_size = self.point_size_box.value()
+        for line in plot.dotted_lines + plot.dotted_simulation_lines:
+            if line_width != C.LINE_WIDTH:
+                line.set_line_width(line_width)
+            if point_size != C.POINT_SIZE:
+                line.set_point_size(point_size)
+            if not self.line_box.isChecked():
+                line.hide_lines()
+            if not self.point_box.isChecked():
+                line.hide_points()
+            if not self.error_box.isChecked():
+                line.hide_errors()
+
     def visu_spec_plot_box_changed(self, state, callable_checked,
                                    callable_unchecked):
         """
@@ -275,7 +298,8 @@ class CorrelationOptionMenu(QMainWindow):
         """
         size = self.point_size_box.value()
         for plot in self.plots:
-            plot.set_correlation_point_size(size)
+            if plot is not None:
+                plot.set_correlation_point_size(size)
 
     def index_changed(self, i: int):
         """
@@ -283,16 +307,30 @@ class CorrelationOptionMenu(QMainWindow):
         selected id.
         """
         for plot in self.plots:
-            color_by = self.cbox.itemText(i)
-            plot.add_points(plot.overview_df, color_by)
+            if plot is not None:
+                color_by = self.cbox.itemText(i)
+                plot.add_points(plot.overview_df, color_by)
+
+    def apply_states(self, plot):
+        """
+        Apply the current options to a newly created plot.
+
+        Arguments:
+            plot: A VisSpecPlot or BarPlot
+        """
+        if self.point_size_box.value() != C.POINT_SIZE:
+            plot.set_correlation_point_size(self.point_size_box.value())
+        if self.cbox.currentIndex() > 0:
+            plot.add_points(plot.overview_df, self.cbox.currentText())
 
 
 class OverviewPlotWindow(QMainWindow):
     """
     Window for plotting and displaying an overview plot.
     """
-    def __init__(self, measurement_df, simulation_df):
+    def __init__(self, window, measurement_df, simulation_df):
         super(OverviewPlotWindow, self).__init__()
+        self.main_window = window
         self.measurement_df = measurement_df
         self.simulation_df = simulation_df
         self.resize(1000, 500)
@@ -359,7 +397,9 @@ class OverviewPlotWindow(QMainWindow):
         self.overview_plot.clear()
         id = self.id_list.itemText(i)
         self.overview_plot.setTitle(id)
-        self.generate_overview_plot(id)
+        # display the warnings in the main window
+        with self.main_window.redirect_warnings():
+            self.generate_overview_plot(id)
 
     def generate_overview_plot(self, plot_by_id):
         """
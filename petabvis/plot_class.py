@@ -1,6 +1,7 @@
 import pandas as pd
 import pyqtgraph as pg
 import petab
+import petab.C as ptc
 import scipy
 
 from . import utils
@@ -23,8 +24,11 @@ class PlotClass:
         condition_df: PEtab condition table
         plot_id: Id of the plot (has to in the visualization_df aswell)
         error_bars: A list of pg.ErrorBarItems
+        color_lookups: Dictionary of the cached color lookup tables
+            of color_map by number of colors
         warnings: String of warning messages if the input is incorrect
             or not supported
+        warning_messages: Set of the messages in warnings
         has_replicates: Boolean, true if replicates are present
         plot_title: The title of the plot
         plot: PlotItem for the main plot (line or bar)
@@ -43,16 +47,18 @@ class PlotClass:
         self.visualization_df = visualization_df
         self.simulation_df = simulation_df
         self.condition_df = condition_df
-        self.overview_df = pd.DataFrame(
-            columns=[C.X, C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID, C.X_VAR,
-                     C.OBSERVABLE_ID, C.SIMULATION_CONDITION_ID])
+        self.overview_df = utils.empty_overview_df(
+            [C.X, C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID, C.X_VAR,
+             C.OBSERVABLE_ID, C.SIMULATION_CONDITION_ID])
         self.plot_id = plot_id
         self.color_map = color_map
         if color_map is None:
             self.color_map = utils.generate_color_map("viridis")
+        self.color_lookups = {}
         self.error_bars = []
         self.disabled_rows = set()  # set of plot_ids that are disabled
         self.warnings = ""
+        self.warning_messages = set()
         self.has_replicates = petab.measurements.measurements_have_replicates(
             self.measurement_df)
         self.plot_title = utils.get_plot_title(self.visualization_df)
@@ -78,17 +84,18 @@ class PlotClass:
         if not overview_df.empty:
             overview_df = overview_df[~overview_df[C.DATASET_ID].
                                       isin(self.disabled_rows)]
-            measurements = overview_df[~overview_df[C.IS_SIMULATION]][
-                C.Y].tolist()
-            simulations = overview_df[overview_df[C.IS_SIMULATION]][
-                C.Y].tolist()
+            is_simulation = overview_df[C.IS_SIMULATION].to_numpy(dtype=bool)
+            y_values = overview_df[C.Y].to_numpy(dtype=float)
+            measurements = y_values[~is_simulation]
+            simulations = y_values[is_simulation]
 
             self.add_points(overview_df, color_by)
             self.correlation_plot.setLabel("left", "Simulation")
             self.correlation_plot.setLabel("bottom", "Measurement")
 
-            min_value = min(measurements + simulations)
-            max_value = max(measurements + simulations)
+            # measurements and simulations together are all y_values
+            min_value = y_values.min()
+            max_value = y_values.max()
             self.correlation_plot.setRange(xRange=(min_value, max_value),
                                            yRange=(min_value, max_value))
             self.correlation_plot.addItem(pg.InfiniteLine([0, 0], angle=45))
@@ -115,8 +122,10 @@ class PlotClass:
         """
         overview_df = self.overview_df[~self.overview_df[C.DATASET_ID].
                                        isin(self.disabled_rows)]
-        measurements = overview_df[~overview_df[C.IS_SIMULATION]][C.Y].tolist()
-        simulations = overview_df[overview_df[C.IS_SIMULATION]][C.Y].tolist()
+        is_simulation = overview_df[C.IS_SIMULATION].to_numpy(dtype=bool)
+        y_values = overview_df[C.Y].to_numpy(dtype=float)
+        measurements = y_values[~is_simulation]
+        simulations = y_values[is_simulation]
         r_squared = self.get_r_squared(measurements, simulations)
         text = "R Squared:\n{:.3f}".format(r_squared)
         self.r_squared_text.setText(str(text))
@@ -134,20 +143,24 @@ class PlotClass:
         group_ids = overview_df[grouping].unique()
         overview_df = overview_df[~overview_df[C.DATASET_ID].
                                   isin(self.disabled_rows)]
-        color_lookup = self.color_map.getLookupTable(nPts=len(group_ids))
+        # partition the enabled points once instead of
+        # comparing the grouping column for every group
+        group_dfs = dict(list(overview_df.groupby(grouping, sort=False)))
+        color_lookup = self.get_color_lookup(len(group_ids))
         for i, group_id in enumerate(group_ids):
             if group_id in self.disabled_rows:
                 continue
             # data
-            reduced_df = overview_df[overview_df[grouping] == group_id]
-            measurements = reduced_df[~reduced_df[C.IS_SIMULATION]][C.Y]
-            measurements = measurements.tolist()
-            simulations = reduced_df[reduced_df[C.IS_SIMULATION]][C.Y].tolist()
-            names = reduced_df[~reduced_df[C.IS_SIMULATION]][C.NAME].tolist()
-            simulation_condition_ids = reduced_df[~reduced_df[
-                C.IS_SIMULATION]][C.SIMULATION_CONDITION_ID].tolist()
-            observable_ids = reduced_df[reduced_df[
-                C.IS_SIMULATION]][C.OBSERVABLE_ID].tolist()
+            reduced_df = group_dfs.get(group_id, overview_df.iloc[:0])
+            is_simulation = reduced_df[C.IS_SIMULATION].to_numpy(dtype=bool)
+            measurement_df = reduced_df[~is_simulation]
+            simulation_df = reduced_df[is_simulation]
+            measurements = measurement_df[C.Y].tolist()
+            simulations = simulation_df[C.Y].tolist()
+            names = measurement_df[C.NAME].tolist()
+            simulation_condition_ids = measurement_df[
+                C.SIMULATION_CONDITION_ID].tolist()
+            observable_ids = simulation_df[C.OBSERVABLE_ID].tolist()
             point_descriptions = [
                 (names[i] + "\nmeasurement: " + str(measurements[i]) +
                  "\nsimulation: " + str(simulations[i]) +
@@ -158,9 +171,8 @@ class PlotClass:
 
             # only line plots have x-values, barplots do not
             if C.X_LABEL in reduced_df.columns:
-                x = reduced_df[~reduced_df[C.IS_SIMULATION]][C.X].tolist()
-                x_label = reduced_df[~reduced_df[C.IS_SIMULATION]][
-                    C.X_LABEL].tolist()
+                x = measurement_df[C.X].tolist()
+                x_label = measurement_df[C.X_LABEL].tolist()
                 point_descriptions = [
                     (point_descriptions[i] + "\n" + str(x_label[i])) + ": " +
                     str(x[i]) for i in range(len(point_descriptions))]
@@ -170,9 +182,11 @@ class PlotClass:
             scatter_plot = pg.ScatterPlotItem(pen=pg.mkPen(None),
                                               brush=pg.mkBrush(color),
                                               name=group_id)
-            spots = [{'pos': [m, s], 'data': idx} for m, s, idx in
-                     zip(measurements, simulations, point_descriptions)]
-            scatter_plot.addPoints(spots)
+            # add all points at once instead of one spot dict per point
+            n_points = len(point_descriptions)
+            scatter_plot.addPoints(x=measurements[:n_points],
+                                   y=simulations[:n_points],
+                                   data=point_descriptions)
             self.correlation_plot.addItem(scatter_plot)
             self.add_point_interaction(scatter_plot)
             if grouping == C.DATASET_ID:
@@ -211,12 +225,12 @@ class PlotClass:
         and simulation values.
 
         Arguments:
-            measurements: List of measurement values
-            simulations: List of simulation values
+            measurements: Array of measurement values
+            simulations: Array of simulation values
         Returns:
             The R^2 value
         """
-        if not measurements or not simulations:
+        if len(measurements) == 0 or len(simulations) == 0:
             return 0
         slope, intercept, r_value, p_value, std_err = scipy.stats.linregress(
             measurements, simulations)
@@ -227,6 +241,30 @@ class PlotClass:
 
         return r_value ** 2
 
+    def get_plot_condition_df(self, exp_data: pd.DataFrame):
+        """
+        Reduce the condition df to the conditions that are used by the
+        rows of exp_data belonging to this plot (by datasetId).
+        The rows of the plot then only have to search this reduced
+        condition df instead of the whole one.
+
+        Arguments:
+            exp_data: Measurement or simulation df
+
+        Returns:
+            The reduced condition df (None if no condition df is provided)
+        """
+        if self.condition_df is None or exp_data is None:
+            return self.condition_df
+
+        plot_data = exp_data
+        if self.visualization_df is not None and \
+                ptc.DATASET_ID in self.visualization_df.columns and \
+                ptc.DATASET_ID in exp_data.columns:
+            plot_data = exp_data[exp_data[ptc.DATASET_ID].isin(
+                self.visualization_df[ptc.DATASET_ID])]
+        return utils.reduce_condition_df(plot_data, self.condition_df)
+
     def add_warning(self, message: str):
         """
         Adds the message to the warnings box
@@ -235,7 +273,8 @@ class PlotClass:
             message: The message to display
         """
         # filter out double warnings
-        if message not in self.warnings:
+        if message not in self.warning_messages:
+            self.warning_messages.add(message)
             self.warnings = self.warnings + message + "\n"
 
     def set_correlation_point_size(self, size: float):
@@ -267,10 +306,27 @@ class PlotClass:
         in the correlation plot accordingly.
         """
         self.color_map = color_map
+        self.color_lookups = {}
         items = self.correlation_plot.listDataItems()
-        color_lookup = self.color_map.getLookupTable(nPts=len(items))
+        color_lookup = self.get_color_lookup(len(items))
         for i, item in enumerate(items):
             item.setBrush(pg.mkBrush(color_lookup[i]))
 
+    def get_color_lookup(self, n_colors: int):
+        """
+        Return n_colors colors evenly spaced along the color map.
+        The lookup tables are cached until the color map changes.
+
+        Arguments:
+            n_colors: Number of colors
+
+        Returns:
+            Array of RGB(A) values
+        """
+        if n_colors not in self.color_lookups:
+            self.color_lookups[n_colors] = self.color_map.getLookupTable(
+                nPts=n_colors)
+        return self.color_lookups[n_colors]
+
     def get_plot(self):
         return self.plot
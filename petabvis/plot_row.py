@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
 import petab.C as ptc
@@ -13,25 +15,35 @@ class PlotRow(row_class.RowClass):
     Used for line plots.
 
     Attributes:
-        x_data: Numpy array of the x-values
-        y_data: Numpy array of the y-values
+        x_data: Contiguous float64 numpy array of the x-values
+        y_data: Contiguous float64 numpy array of the y-values
         sd: Standard deviation of the replicates
         sem: Standard error of the mean of the replicates
+        replicate_stats: Dictionary with the mean, sd and sem
+            of the replicates
         provided noise: Noise of the measurements
     """
 
     def __init__(self, exp_data: pd.DataFrame,
-                 plot_spec: pd.Series, condition_df: pd.DataFrame, ):
+                 plot_spec: NamedTuple, condition_df: pd.DataFrame,
+                 is_simulation: bool = False,
+                 condition_positions: dict = None):
 
-        super().__init__(exp_data, plot_spec, condition_df)
+        super().__init__(exp_data, plot_spec, condition_df, is_simulation,
+                         condition_positions)
 
         # calculate new attributes
-        self.y_data = self.get_y_data()
-        self.x_data = self.get_x_data()
-        self.sd = utils.sd_replicates(self.line_data, self.x_var,
-                                      self.is_simulation)
-        self.sem = utils.sem_replicates(self.line_data, self.x_var,
-                                        self.is_simulation)
+        # (the replicates are only grouped once for all statistics)
+        self.replicate_stats = utils.agg_replicates(
+            self.line_data, self.x_var, self.get_y_variable_name())
+        # (stored as contiguous float arrays, such that pyqtgraph
+        # does not need to copy them again when drawing the line)
+        self.y_data = np.ascontiguousarray(self.get_y_data(),
+                                           dtype=np.float64)
+        self.x_data = np.ascontiguousarray(self.get_x_data(),
+                                           dtype=np.float64)
+        self.sd = self.replicate_stats["sd"]
+        self.sem = self.replicate_stats["sem"]
         self.provided_noise = self.get_provided_noise()
         self.simulation_condition_id = self.get_simulation_condition_id()
 
@@ -57,7 +69,7 @@ class PlotRow(row_class.RowClass):
                 # (only needed if no replicate id col is provided)
                 x_data = np.array(sorted(set(self.replicates[0][self.x_var])))
             else:
-                x_data = np.asarray(self.replicates[0][self.x_var])
+                x_data = self.replicates[0][self.x_var].to_numpy(copy=False)
             x_data = x_data + self.x_offset
 
         return x_data
@@ -94,11 +106,7 @@ class PlotRow(row_class.RowClass):
             self.get_min_and_max_of_replicates()
             return np.hstack(self.get_replicate_y_data())
 
-        # variable is either measurement or simulation
-        variable = self.get_y_variable_name()
-        y_data = utils.mean_replicates(self.line_data, self.x_var,
-                                       variable)
-        y_data = y_data + self.y_offset
+        y_data = self.replicate_stats["mean"] + self.y_offset
 
         return y_data
 
@@ -133,7 +141,7 @@ class PlotRow(row_class.RowClass):
         x_data = []
 
         if self.x_var != ptc.TIME:
-            x_values = np.asarray(self.condition_df[self.x_var])
+            x_values = self.condition_df[self.x_var].to_numpy(copy=False)
             x_values = x_values + self.x_offset
             # the x-values are the same for replicates of
             # concentration plots, thus we repeat them until
@@ -151,7 +159,7 @@ class PlotRow(row_class.RowClass):
                             self.replicates[0].groupby(self.x_var, sort=True)]
         for replicate in self.replicates:
             if ptc.REPLICATE_ID in self.line_data.columns:
-                x_values = np.asarray(replicate[self.x_var])
+                x_values = replicate[self.x_var].to_numpy(copy=False)
             else:
                 # when no explicit replicate id is given, we assume that
                 # each replicate uses the same x-values which are determined
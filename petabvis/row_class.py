@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
 import petab
@@ -14,7 +16,11 @@ class RowClass:
     Arguments:
         exp_data: PEtab measurement table
         plot_spec: A single row of a PEtab visualization table
-        condition_df: PEtab condition table
+        condition_df: PEtab condition table (can already be reduced
+            to the conditions of the plot)
+        is_simulation: Boolean, True if exp_data is a simulation df
+        condition_positions: Mapping from the condition ids of
+            condition_df to their row positions
 
     Attributes:
         line_data: PEtab measurement or
@@ -40,7 +46,9 @@ class RowClass:
     """
 
     def __init__(self, exp_data: pd.DataFrame,
-                 plot_spec: pd.Series, condition_df: pd.DataFrame, ):
+                 plot_spec: NamedTuple, condition_df: pd.DataFrame,
+                 is_simulation: bool = False,
+                 condition_positions: dict = None):
         # placeholder value, will be overwritten by plot_row
         self.x_data = []
         # placeholder value, will be overwritten by plot_row/bar_row
@@ -62,22 +70,22 @@ class RowClass:
         self.y_scale = utils.get_y_scale(plot_spec)
         self.legend_name = utils.get_legend_name(plot_spec)
         self.plot_type_data = utils.get_plot_type_data(plot_spec)
-        self.is_simulation = ptc.SIMULATION in exp_data.columns
+        self.is_simulation = is_simulation
         self.simulation_condition_id = ""
 
         # reduce dfs to relevant rows
-        self.line_data = exp_data
-        if self.dataset_id and ptc.DATASET_ID in self.line_data:  # != ""
-            self.line_data = self.line_data[
-                self.line_data[ptc.DATASET_ID] == self.dataset_id]
+        # (combine all filters into one mask to only copy the data once)
+        rows = np.ones(len(exp_data), dtype=bool)
+        if self.dataset_id and ptc.DATASET_ID in exp_data:  # != ""
+            rows &= exp_data[ptc.DATASET_ID].to_numpy() == self.dataset_id
         if self.y_var:  # != ""
             # filter by y-values if specified
-            self.line_data = self.line_data[
-                self.line_data[ptc.OBSERVABLE_ID] == self.y_var]
+            rows &= exp_data[ptc.OBSERVABLE_ID].to_numpy() == self.y_var
+        self.line_data = exp_data.iloc[np.flatnonzero(rows)]
         if self.condition_df is not None and self.x_var != ptc.TIME:
             # reduce the condition df to the relevant rows (by condition id)
-            self.condition_df = utils.reduce_condition_df(self.line_data,
-                                                          self.condition_df)
+            self.condition_df = utils.reduce_condition_df(
+                self.line_data, self.condition_df, condition_positions)
 
         self.observable_id = utils.get_observable_id(self.line_data)
         self.has_replicates = petab.measurements.measurements_have_replicates(
@@ -1,11 +1,27 @@
+import numpy as np
 import petab.C as ptc
-from PySide6 import QtWidgets, QtCore, QtGui
+from PySide6 import QtWidgets, QtCore
 from PySide6.QtCore import (QAbstractTableModel, QModelIndex, Qt)
 from PySide6.QtGui import QColor
 
 
 class PetabTableModel(QAbstractTableModel):
-    """PEtab data table model."""
+    """
+    PEtab data table model.
+
+    Attributes:
+        df: The displayed dataframe
+        column_values: A numpy array of each column of df
+            (to avoid the pandas indexing overhead per cell)
+        column_positions: Dictionary mapping the column names
+            to their positions
+        column_names: Numpy array of the column names
+        row_names: Numpy array of the index
+    """
+    # created once instead of for every cell on each repaint
+    WHITE = QColor(Qt.white)
+    YELLOW = QColor(Qt.yellow)
+    ALIGN_RIGHT = Qt.AlignRight
 
     def __init__(self, df=None):
         QAbstractTableModel.__init__(self)
@@ -15,13 +31,19 @@ class PetabTableModel(QAbstractTableModel):
         self.column_count = df.shape[1]
 
     def load_data(self, data):
-        for x in data:
-            setattr(self, x, data[x])
+        # one array per column to keep the dtype of each column
+        self.column_values = [data.iloc[:, i].to_numpy()
+                              for i in range(data.shape[1])]
+        self.column_positions = {name: i for i, name
+                                 in enumerate(data.columns)}
+        self.column_names = data.columns.to_numpy()
+        self.row_names = data.index.to_numpy()
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         row = index.row()
         column = index.column()
         self.df.iloc[row, column] = value
+        self.column_values[column] = self.df.iloc[:, column].to_numpy()
         return True
 
     def rowCount(self, parent=QModelIndex()):
@@ -35,26 +57,46 @@ class PetabTableModel(QAbstractTableModel):
             return None
 
         if orientation == Qt.Horizontal:
-            return self.df.columns[section]
+            return self.column_names[section]
         else:
-            return self.df.index[section]
+            return self.row_names[section]
 
     def data(self, index, role=Qt.DisplayRole):
         column = index.column()
         row = index.row()
         if role == Qt.DisplayRole:
-            return str(self.df.iloc[row, column])
+            return str(self.column_values[column][row])
 
         elif role == Qt.BackgroundRole:
-            return QColor(Qt.white)
+            return self.WHITE
 
         elif role == Qt.TextAlignmentRole:
-            return Qt.AlignRight
+            return self.ALIGN_RIGHT
 
         return None
 
     def get_value(self, row, column):
-        return self.df.iloc[row][column]
+        return self.column_values[self.column_positions[column]][row]
+
+    def set_current_plot(self, current_plot):
+        """
+        Update the highlighted rows for a newly displayed plot.
+        Plain tables do not highlight any rows.
+
+        Arguments:
+            current_plot: The displayed VisSpecPlot or BarPlot
+        """
+        pass
+
+    def background_changed(self):
+        """
+        Notify the views that only the background colors changed.
+        """
+        if self.row_count and self.column_count:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.row_count - 1, self.column_count - 1),
+                [Qt.BackgroundRole])
 
 
 class VisualizationTableModel(PetabTableModel):
@@ -63,11 +105,23 @@ class VisualizationTableModel(PetabTableModel):
 
     Make the first column of the table editable for the checkbox column.
     Highlight the rows of the currently displayed plot.
+
+    Attributes:
+        current_plot_id: The plotId of the highlighted rows
+        highlighted_rows: Boolean numpy array, True for the rows
+            of the current plot
     """
 
     def __init__(self, df=None, window=None):
         PetabTableModel.__init__(self, df)
         self.window = window
+        self.current_plot_id = None
+        self.highlighted_rows = None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        # recalculate the highlighted rows on the next repaint
+        self.current_plot_id = None
+        return super().setData(index, value, role)
 
     def flags(self, index):
         # make the first column editable
@@ -83,80 +137,129 @@ class VisualizationTableModel(PetabTableModel):
     def data(self, index, role=Qt.DisplayRole):
         # highlight the currently shown rows
         if role == Qt.BackgroundRole:
-            current_plot = self.window.vis_spec_plots[
-                self.window.current_list_index]
-            current_plot_id = current_plot.plot_id
-            if self.df[ptc.PLOT_ID][index.row()] == current_plot_id:
-                return QColor(Qt.yellow)
+            current_plot = self.window.get_vis_spec_plot(
+                self.window.current_list_index)
+            if current_plot.plot_id != self.current_plot_id:
+                self.current_plot_id = current_plot.plot_id
+                plot_ids = self.column_values[
+                    self.column_positions[ptc.PLOT_ID]]
+                self.highlighted_rows = plot_ids == self.current_plot_id
+            if self.highlighted_rows[index.row()]:
+                return self.YELLOW
             else:
-                return QColor(Qt.white)
+                return self.WHITE
         else:
             return super().data(index, role)
 
     def get_window(self):
         return self.window
 
+    def set_current_plot(self, current_plot):
+        """
+        Highlight the rows of a newly displayed plot.
+
+        Arguments:
+            current_plot: The displayed VisSpecPlot or BarPlot
+        """
+        self.current_plot_id = current_plot.plot_id
+        plot_ids = self.column_values[self.column_positions[ptc.PLOT_ID]]
+        self.highlighted_rows = plot_ids == self.current_plot_id
+        self.background_changed()
+
+    def get_checkbox_state(self, row):
+        """
+        Return the value of the checkbox column (0 or 1) of a row.
+        """
+        return self.column_values[0][row]
+
 
 class MeasurementTableModel(PetabTableModel):
     """
     Special table model for measurement files.
 
     Highlight the rows of the currently displayed plot.
+
+    Attributes:
+        highlighted_rows: Boolean numpy array, True for the rows
+            of the current plot
     """
     def __init__(self, df=None, window=None):
         PetabTableModel.__init__(self, df)
         self.window = window
         self.current_plot_id = ""
+        self.current_disabled_rows = set()
         self.current_dataset_ids = []
         self.current_observable_ids = []
+        self.highlighted_rows = np.zeros(self.row_count, dtype=bool)
 
     def data(self, index, role=Qt.DisplayRole):
         # highlight rows that are currently plotted
         if role != Qt.BackgroundRole:
             return super().data(index, role)
 
-        current_plot = self.window.vis_spec_plots[
-            self.window.current_list_index]
+        current_plot = self.window.get_vis_spec_plot(
+            self.window.current_list_index)
+        # only recalculate the highlighted rows if the current plot
+        # or its disabled lines change
+        if current_plot.plot_id != self.current_plot_id or \
+                current_plot.disabled_rows != self.current_disabled_rows:
+            self.update_highlighted_rows(current_plot)
+
+        if self.highlighted_rows[index.row()]:
+            return self.YELLOW
+
+        return super().data(index, role)
+
+    def set_current_plot(self, current_plot):
+        """
+        Highlight the rows of a newly displayed plot.
+
+        Arguments:
+            current_plot: The displayed VisSpecPlot or BarPlot
+        """
+        self.update_highlighted_rows(current_plot)
+        self.background_changed()
+
+    def update_highlighted_rows(self, current_plot):
+        """
+        Calculate which rows belong to the lines of the current plot.
+
+        Arguments:
+            current_plot: The currently displayed VisSpecPlot or BarPlot
+        """
         # for default plots, plot_id is the observableId
         # otherwise it is the datasetId
         plot_id = current_plot.plot_id
-        row = self.df.iloc[index.row()]
+        self.current_plot_id = plot_id
+        self.current_disabled_rows = set(current_plot.disabled_rows)
 
         # for default plots
         if self.window.visualization_df is None:
-            if row[ptc.OBSERVABLE_ID] == plot_id:
-                return QColor(Qt.yellow)
-            else:
-                return super().data(index, role)
-
-        # only recalculate the plot_ids and
-        # observable ids if the current plot changes
-        if plot_id != self.current_plot_id:
-            vis_df = self.window.visualization_df
-            if ptc.DATASET_ID in vis_df.columns:
-                self.current_dataset_ids = list(vis_df[
-                    vis_df[ptc.PLOT_ID] == plot_id]
-                    [ptc.DATASET_ID].unique())
-            if ptc.Y_VALUES in vis_df.columns:
-                self.current_observable_ids = list(vis_df[
-                    vis_df[ptc.PLOT_ID] == plot_id]
-                    [ptc.Y_VALUES].unique())
-            self.current_plot_id = plot_id
-
-        correct_dataset_id = True
-        correct_observable_id = True
-        if self.current_dataset_ids and ptc.DATASET_ID in row.index:
-            disabled_ids = current_plot.disabled_rows
-            correct_dataset_id = row[ptc.DATASET_ID] in \
-                self.current_dataset_ids and row[ptc.DATASET_ID] \
-                not in disabled_ids
+            self.highlighted_rows = \
+                self.df[ptc.OBSERVABLE_ID].to_numpy() == plot_id
+            return
+
+        vis_df = self.window.visualization_df
+        if ptc.DATASET_ID in vis_df.columns:
+            self.current_dataset_ids = list(vis_df[
+                vis_df[ptc.PLOT_ID] == plot_id]
+                [ptc.DATASET_ID].unique())
+        if ptc.Y_VALUES in vis_df.columns:
+            self.current_observable_ids = list(vis_df[
+                vis_df[ptc.PLOT_ID] == plot_id]
+                [ptc.Y_VALUES].unique())
+
+        rows = np.ones(self.row_count, dtype=bool)
+        if self.current_dataset_ids and \
+                ptc.DATASET_ID in self.column_positions:
+            dataset_ids = self.df[ptc.DATASET_ID]
+            rows &= dataset_ids.isin(self.current_dataset_ids).to_numpy()
+            rows &= ~dataset_ids.isin(
+                self.current_disabled_rows).to_numpy()
         if self.current_observable_ids:
-            correct_observable_id = row[ptc.OBSERVABLE_ID] \
-                                    in self.current_observable_ids
-        if correct_dataset_id and correct_observable_id:
-            return QtGui.QColor("yellow")
-
-        return super().data(index, role)
+            rows &= self.df[ptc.OBSERVABLE_ID].isin(
+                self.current_observable_ids).to_numpy()
+        self.highlighted_rows = rows
 
     def get_window(self):
         return self.window
@@ -185,9 +288,13 @@ class CheckBoxDelegate(QtWidgets.QItemDelegate):
         """
         Paint a checkbox without the label.
         """
+        # read the state directly instead of the displayed string
+        proxy_model = index.model()
+        row = proxy_model.mapToSource(index).row()
+        state = proxy_model.sourceModel().get_checkbox_state(row)
         self.drawCheck(painter, option, option.rect,
-                       QtCore.Qt.Unchecked if int(
-                        index.data()) == 0 else QtCore.Qt.Checked)
+                       QtCore.Qt.Unchecked if state == 0
+                       else QtCore.Qt.Checked)
 
     def editorEvent(self, event, model, option, index):
         """
@@ -209,10 +316,9 @@ class CheckBoxDelegate(QtWidgets.QItemDelegate):
             plot_id = model.sourceModel().get_value(index.row(), ptc.PLOT_ID)
             dataset_id = model.sourceModel().get_value(index.row(),
                                                        ptc.DATASET_ID)
-            # Set `vis_spec_plot` to the one that matches `plot_id`
-            for vis_spec_plot in window.vis_spec_plots:
-                if vis_spec_plot.plot_id == plot_id:
-                    break
+            # get the plot that matches `plot_id`
+            vis_spec_plot = window.get_vis_spec_plot(
+                window.plot_positions[plot_id])
             vis_spec_plot.add_or_remove_line(dataset_id)
             self.setModelData(None, model, index)
             return True
@@ -1,209 +1,219 @@
+import functools
 import warnings
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
 import petab.C as ptc
-import scipy
-from PySide6 import QtCore
 from PySide6.QtWidgets import QComboBox
-import matplotlib.pyplot as plt
 import pyqtgraph as pg
 
+from . import C
 
-def get_legend_name(plot_spec: pd.Series):
+
+def get_legend_name(plot_spec: NamedTuple):
     """
     Return the plot title of the plot specification
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
     Return:
         The name of the legend entry
     """
-    legend_name = ""
-    if ptc.DATASET_ID in plot_spec.index:
-        legend_name = plot_spec[ptc.DATASET_ID]
-    if ptc.LEGEND_ENTRY in plot_spec.index:
-        legend_name = plot_spec[ptc.LEGEND_ENTRY]
+    legend_name = getattr(plot_spec, ptc.DATASET_ID, "")
+    legend_name = getattr(plot_spec, ptc.LEGEND_ENTRY, legend_name)
 
     return legend_name
 
 
-def get_x_var(plot_spec: pd.Series):
+def get_x_var(plot_spec: NamedTuple):
     """
     Return the name of the x variable of the plot specification
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
     Return:
         The name of the x variable
     """
-    x_var = "time"  # default value
-    if ptc.X_VALUES in plot_spec.index:
-        x_var = plot_spec[ptc.X_VALUES]
+    x_var = getattr(plot_spec, ptc.X_VALUES, "time")
 
     return x_var
 
 
 def get_observable_id(line_data: pd.DataFrame):
-    observable_id = line_data[ptc.OBSERVABLE_ID].unique()
-    if len(observable_id) > 1:
+    observable_ids = line_data[ptc.OBSERVABLE_ID]
+    observable_id = observable_ids.iat[0]
+    # only collect the unique ids if there is more than one
+    if (observable_ids.to_numpy() != observable_id).any():
         warnings.warn("Observable ID is not unique for line"
-                      "(IDs: " + ', '.join(observable_id) +
+                      "(IDs: " + ', '.join(observable_ids.unique()) +
                       "   might affect coloring)")
-    return observable_id[0]
+    return observable_id
 
 
-def get_y_var(plot_spec: pd.Series):
+def get_y_var(plot_spec: NamedTuple):
     """
     Return the observable which should be plotted on the y-axis
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
     Return:
         observable which should be plotted on the y-axis
     """
-    y_var = ""  # default value
-    if ptc.Y_VALUES in plot_spec.index:
-        y_var = plot_spec[ptc.Y_VALUES]
+    y_var = getattr(plot_spec, ptc.Y_VALUES, "")
 
     return y_var
 
 
-def get_x_offset(plot_spec: pd.Series):
+def get_x_offset(plot_spec: NamedTuple):
     """
     Return the x offset
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The x offset
     """
-    x_offset = 0  # default value
-    if ptc.X_OFFSET in plot_spec.index:
-        x_offset = float(plot_spec[ptc.X_OFFSET])
+    x_offset = float(getattr(plot_spec, ptc.X_OFFSET, 0))
 
     return x_offset
 
 
-def get_x_scale(plot_spec: pd.Series):
+def get_x_scale(plot_spec: NamedTuple):
     """
     Return the scale of the x axis (lin, log or ordinal)
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The x scale
     """
 
-    x_scale = "lin"  # default value
-    if ptc.X_SCALE in plot_spec.index:
-        x_scale = plot_spec[ptc.X_SCALE]
+    x_scale = getattr(plot_spec, ptc.X_SCALE, "lin")
 
     return x_scale
 
 
-def get_y_scale(plot_spec: pd.Series):
+def get_y_scale(plot_spec: NamedTuple):
     """
     Return the scale of the y axis (lin, log or ordinal)
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The x offset
     """
-    y_scale = "lin"  # default value
-    if ptc.Y_SCALE in plot_spec.index:
-        y_scale = plot_spec[ptc.Y_SCALE]
+    y_scale = getattr(plot_spec, ptc.Y_SCALE, "lin")
 
     return y_scale
 
 
-def get_y_offset(plot_spec: pd.Series):
+def get_y_offset(plot_spec: NamedTuple):
     """
     Return the y offset
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The y offset
     """
-    y_offset = 0  # default value
-    if ptc.Y_OFFSET in plot_spec.index:
-        y_offset = float(plot_spec[ptc.Y_OFFSET])
+    y_offset = float(getattr(plot_spec, ptc.Y_OFFSET, 0))
 
     return y_offset
 
 
-def get_x_label(plot_spec: pd.Series):
+def get_x_label(plot_spec: NamedTuple):
     """
     Return the label of the x axis
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The label of the x axis
     """
-    x_label = get_x_var(plot_spec)  # defaults to x_var
-    if ptc.X_LABEL in plot_spec.index:
-        x_label = plot_spec[ptc.X_LABEL]
+    # defaults to x_var
+    x_label = getattr(plot_spec, ptc.X_LABEL, get_x_var(plot_spec))
 
     return x_label
 
 
-def get_y_label(plot_spec: pd.Series):
+def get_y_label(plot_spec: NamedTuple):
     """
     Return the label of the y axis
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The label of the y axis
     """
-    y_label = ptc.MEASUREMENT  # defaults to y_var
-    if ptc.Y_LABEL in plot_spec.index:
-        y_label = plot_spec[ptc.Y_LABEL]
+    y_label = getattr(plot_spec, ptc.Y_LABEL, ptc.MEASUREMENT)
 
     return y_label
 
 
-def get_dataset_id(plot_spec: pd.Series):
+def get_dataset_id(plot_spec: NamedTuple):
     """
     Return the dataset id
 
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
 
     Return:
         The dataset id
     """
-    dataset_id = ""
-    if ptc.DATASET_ID in plot_spec.index:
-        dataset_id = plot_spec[ptc.DATASET_ID]
+    dataset_id = getattr(plot_spec, ptc.DATASET_ID, "")
 
     return dataset_id
 
 
-def get_plot_type_data(plot_spec: pd.Series):
+def get_plot_type_data(plot_spec: NamedTuple):
     """
     Return the dataset id
     Arguments:
        plot_spec: A single row of a visualization df
+           (as returned by DataFrame.itertuples)
     Return:
         The dataset id
     """
-    plot_type_data = "MeanAndSD"
-    if ptc.PLOT_TYPE_DATA in plot_spec.index:
-        plot_type_data = plot_spec[ptc.PLOT_TYPE_DATA]
+    plot_type_data = getattr(plot_spec, ptc.PLOT_TYPE_DATA, "MeanAndSD")
 
     return plot_type_data
 
 
-def reduce_condition_df(line_data, condition_df):
+def get_condition_positions(condition_df: pd.DataFrame):
+    """
+    Map the condition ids of the condition df to their row positions.
+
+    Arguments:
+        condition_df: The condition df
+
+    Return:
+        Dictionary from condition id to row position
+        (None if no condition df is provided)
+    """
+    if condition_df is None:
+        return None
+    return {condition_id: position for position, condition_id
+            in enumerate(condition_df.index)}
+
+
+def reduce_condition_df(line_data, condition_df,
+                        condition_positions: dict = None):
     """
     Reduce the condition df to the relevant rows based
     on the unique condition ids in the line_data df
@@ -211,23 +221,48 @@ def reduce_condition_df(line_data, condition_df):
     Arguments:
         line_data: A subset of a measurement df
         condition_df: The condition df
+        condition_positions: Optional mapping from condition id to
+            row position (see get_condition_positions). If provided,
+            the rows are looked up instead of searching the whole index.
 
     Return:
         The reduced condition df
     """
-    uni_condition_id, uind = np.unique(
-        line_data[ptc.SIMULATION_CONDITION_ID],
-        return_index=True)
-    # keep the ordering which was given by user from top to bottom
-    # (avoid ordering by names '1','10','11','2',...)'
-    uni_condition_id = uni_condition_id[np.argsort(uind)]
+    # pd.unique keeps the ordering which was given by user from top
+    # to bottom (avoid ordering by names '1','10','11','2',...)'
+    uni_condition_id = pd.unique(line_data[ptc.SIMULATION_CONDITION_ID])
 
     # extract conditions (plot input) from condition file
+    if condition_positions is not None:
+        # sort the positions to keep the order of the condition df
+        positions = sorted(condition_positions[condition_id]
+                           for condition_id in uni_condition_id
+                           if condition_id in condition_positions)
+        return condition_df.iloc[positions]
     ind_cond = condition_df.index.isin(uni_condition_id)
     condition_df = condition_df[ind_cond]
     return condition_df
 
 
+def empty_overview_df(columns):
+    """
+    Create an empty overview df with typed columns, so that
+    concatenated rows keep numeric and boolean dtypes instead
+    of being upcast to object.
+
+    Arguments:
+        columns: The column names of the overview df
+
+    Returns:
+        The empty overview df
+    """
+    dtypes = {C.X: np.float64, C.Y: np.float64, C.SD: np.float64,
+              C.SEM: np.float64, C.PROVIDED_NOISE: np.float64,
+              C.TICK_POS: np.float64, C.IS_SIMULATION: bool}
+    return pd.DataFrame({column: pd.Series(dtype=dtypes.get(column, object))
+                         for column in columns})
+
+
 def get_plot_title(visualization_df_rows: pd.DataFrame):
     """
     Return the title of the plot
@@ -241,9 +276,9 @@ def get_plot_title(visualization_df_rows: pd.DataFrame):
     plot_title = ""
     if visualization_df_rows is not None:
         if ptc.PLOT_NAME in visualization_df_rows.columns:
-            plot_title = visualization_df_rows.iloc[0][ptc.PLOT_NAME]
+            plot_title = visualization_df_rows[ptc.PLOT_NAME].iat[0]
         elif ptc.PLOT_ID in visualization_df_rows.columns:
-            plot_title = visualization_df_rows.iloc[0][ptc.PLOT_ID]
+            plot_title = visualization_df_rows[ptc.PLOT_ID].iat[0]
 
     return plot_title
 
@@ -264,16 +299,7 @@ def mean_replicates(line_data: pd.DataFrame, x_var: str = ptc.TIME,
     Return:
         The mean grouped by x_var
     """
-    grouping = ptc.TIME
-    if x_var != ptc.TIME:
-        # for concentration plots we group by
-        # simulationConditionId
-        grouping = ptc.SIMULATION_CONDITION_ID
-    line_data = line_data[[y_var, grouping]]
-    means = line_data.groupby(grouping).mean()
-    means = means[y_var].to_numpy()
-
-    return means
+    return agg_replicates(line_data, x_var, y_var)["mean"]
 
 
 def sd_replicates(line_data: pd.DataFrame, x_var: str, is_simulation: bool):
@@ -293,18 +319,7 @@ def sd_replicates(line_data: pd.DataFrame, x_var: str, is_simulation: bool):
     if is_simulation:
         y_var = ptc.SIMULATION
 
-    grouping = ptc.TIME
-    if x_var != ptc.TIME:
-        # for concentration plots we group by
-        # simulationConditionId
-        grouping = ptc.SIMULATION_CONDITION_ID
-
-    line_data = line_data[[grouping, y_var]]
-    # std with ddof = 0 (degrees of freedom)
-    # to match np.std that is used in petab
-    sds = line_data.groupby(grouping).std(ddof=0)
-    sds = sds[y_var].to_numpy()
-    return sds
+    return agg_replicates(line_data, x_var, y_var)["sd"]
 
 
 def sem_replicates(line_data: pd.DataFrame, x_var: str, is_simulation: bool):
@@ -318,7 +333,32 @@ def sem_replicates(line_data: pd.DataFrame, x_var: str, is_simulation: bool):
             is measurement or simulation
 
     Return:
-        The std grouped by x_var
+        The sem grouped by x_var
+    """
+    y_var = ptc.MEASUREMENT
+    if is_simulation:
+        y_var = ptc.SIMULATION
+
+    return agg_replicates(line_data, x_var, y_var)["sem"]
+
+
+def agg_replicates(line_data: pd.DataFrame, x_var: str = ptc.TIME,
+                   y_var: str = ptc.MEASUREMENT):
+    """
+    Calculate the mean, standard deviation and standard error
+    of the mean of the replicates, grouping the data only once.
+    The groups are summed up with np.bincount, which avoids the
+    per-call overhead of a pandas groupby for the small line dfs.
+
+    Arguments:
+        line_data: A subset of the measurement file
+        x_var: Name of the x-variable
+        y_var: Name of the y-variable (measurement or simulation)
+
+    Return:
+        Dictionary with the sorted group keys ("groups", i.e. the
+        time points or simulationConditionIds) and the "mean",
+        "sd" and "sem" of each group
     """
     grouping = ptc.TIME
     if x_var != ptc.TIME:
@@ -326,11 +366,32 @@ def sem_replicates(line_data: pd.DataFrame, x_var: str, is_simulation: bool):
         # simulationConditionId
         grouping = ptc.SIMULATION_CONDITION_ID
 
-    sd = sd_replicates(line_data, x_var, is_simulation)
-    n_replicates = [len(replicates) for replicates in
-                    line_data.groupby(grouping)]
-    sem = sd / np.sqrt(n_replicates)
-    return sem
+    # group codes in sorted order (as with groupby),
+    # -1 for rows without a group
+    codes, groups = pd.factorize(line_data[grouping], sort=True)
+    values = line_data[y_var].to_numpy(dtype=np.float64)
+    in_group = codes >= 0
+    codes = codes[in_group]
+    values = values[in_group]
+    # missing values are skipped, as in pandas
+    has_value = ~np.isnan(values)
+    values = np.where(has_value, values, 0)
+
+    # sum up all groups at once instead of aggregating group by group
+    n_groups = len(groups)
+    counts = np.bincount(codes, weights=has_value, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.bincount(codes, weights=values,
+                            minlength=n_groups) / counts
+        deviations = np.where(has_value, values - means[codes], 0)
+        # std with ddof = 0 (degrees of freedom)
+        # to match np.std that is used in petab
+        sds = np.sqrt(np.bincount(codes, weights=deviations ** 2,
+                                  minlength=n_groups) / counts)
+        sems = sds / np.sqrt(counts)
+
+    return {"groups": np.asarray(groups), "mean": means, "sd": sds,
+            "sem": sems}
 
 
 def split_replicates(line_data: pd.DataFrame):
@@ -345,16 +406,13 @@ def split_replicates(line_data: pd.DataFrame):
         line_data: A subset of the measurement file
 
     Return:
-        The std grouped by x_var
+        A list of the replicate dfs
     """
-    replicates = []
     if ptc.REPLICATE_ID in line_data.columns:
-        for repl_id in np.unique(line_data[ptc.REPLICATE_ID]):
-            repl = line_data[line_data[ptc.REPLICATE_ID] == repl_id]
-            replicates.append(repl)
-    else:
-        replicates.append(line_data)
-    return replicates
+        # groups are sorted by replicateId (as with np.unique)
+        return [replicate for _, replicate
+                in line_data.groupby(ptc.REPLICATE_ID)]
+    return [line_data]
 
 
 def add_plotnames_to_cbox(exp_data: pd.DataFrame,
@@ -368,42 +426,25 @@ def add_plotnames_to_cbox(exp_data: pd.DataFrame,
         cbox:  The list of plots (UI)
     """
     if visualization_df is not None:
-        plot_ids = np.unique(visualization_df[ptc.PLOT_ID])
+        # first occurrence of every plot, in the order of the plots
+        plots = visualization_df.drop_duplicates(ptc.PLOT_ID)
         if ptc.PLOT_NAME in visualization_df.columns:
 
             # for every identical plot_id, the plot_name has to be the same
-            plot_names = list(visualization_df[ptc.PLOT_NAME].unique())
-            if len(plot_ids) != len(plot_names):
+            plot_names = plots[ptc.PLOT_NAME].to_numpy()
+            if len(plot_names) != \
+                    visualization_df[ptc.PLOT_NAME].nunique():
                 warnings.warn(
                     "The number of plot ids should be" +
                     " the same as the number of plot names")
 
-            for name in plot_names:
-                cbox.addItem(name)
+            cbox.addItems(list(map(str, plot_names)))
         else:
-            for id in np.unique(visualization_df[ptc.PLOT_ID]):
-                cbox.addItem(id)
+            cbox.addItems(list(map(str, plots[ptc.PLOT_ID].to_numpy())))
     else:
         # the default plots are grouped by observable ID
-        observable_ids = list(exp_data[ptc.OBSERVABLE_ID].unique())
-        for observable_id in observable_ids:
-            cbox.addItem(observable_id)
-
-
-def get_signals(source):
-    """
-    Print out all signals that are implemented in source
-    (only for debug purposes)
-    """
-    cls = source if isinstance(source, type) else type(source)
-    signal = type(QtCore.Signal())
-    print("Signals:")
-    for name in dir(source):
-        try:
-            if isinstance(getattr(cls, name), signal):
-                print(name)
-        except Exception:
-            print("skipped")
+        observable_ids = exp_data[ptc.OBSERVABLE_ID].drop_duplicates()
+        cbox.addItems(list(map(str, observable_ids.to_numpy())))
 
 
 def r_squared(measurements, simulations):
@@ -411,21 +452,37 @@ def r_squared(measurements, simulations):
     Calculate the R squared value between
     the measurement and simulation values.
     """
-    if not measurements or not simulations:
+    measurements = np.asarray(measurements, dtype=np.float64)
+    simulations = np.asarray(simulations, dtype=np.float64)
+    if measurements.size == 0 or simulations.size == 0:
+        return 0
+    # squared pearson correlation coefficient
+    # (same as the r_value of a linear regression)
+    measurement_deviations = measurements - measurements.mean()
+    simulation_deviations = simulations - simulations.mean()
+    covariance = np.dot(measurement_deviations, simulation_deviations)
+    variances = np.dot(measurement_deviations, measurement_deviations) \
+        * np.dot(simulation_deviations, simulation_deviations)
+    if variances == 0:
         return 0
-    slope, intercept, r_value, p_value, std_err = scipy.stats.linregress(
-        measurements, simulations)
-    return r_value ** 2
+    return min(covariance ** 2 / variances, 1.0)
 
 
+@functools.lru_cache(maxsize=32)
 def generate_color_map(cm_name: str):
     """
     Create a pyqtgraph Colormap corresponding
     to the matplotlib name of a colormap.
+    The colormaps are cached, so the returned
+    Colormap must not be modified.
 
     Arguments:
         cm_name: Name of a matplotlib colormap.
     """
+    # matplotlib is only needed for the colormaps
+    # (imported here to not slow down the import of utils)
+    import matplotlib.pyplot as plt
+
     colors = (np.array(plt.get_cmap(cm_name).colors)*255).tolist()
     positions = np.linspace(0, 1, len(colors))
     pg_map = pg.ColorMap(positions, colors)
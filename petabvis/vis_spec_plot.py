@@ -68,18 +68,14 @@ class VisSpecPlot(plot_class.PlotClass):
         self.plot.clear()
         self.plot_rows = self.generate_plot_rows(
             self.measurement_df)  # list of plot_rows
-        self.plot_rows_simulation = self.generate_plot_rows(self.simulation_df)
+        self.plot_rows_simulation = self.generate_plot_rows(
+            self.simulation_df, is_simulation=True)
         self.overview_df = self.generate_overview_df()
 
         self.dotted_lines = self.generate_dotted_lines(self.plot_rows)
         self.dotted_simulation_lines = self.generate_dotted_lines(
             self.plot_rows_simulation, is_simulation=True)
 
-        # make sure the is_simulation column
-        # is really boolean because otherwise
-        # the logical not operator ~ causes problems
-        self.overview_df[C.IS_SIMULATION] = self.overview_df[
-            C.IS_SIMULATION].astype("bool")
         self.generate_plot()
 
         if self.simulation_df is not None:
@@ -96,9 +92,9 @@ class VisSpecPlot(plot_class.PlotClass):
         Returns:
             overview_df: A dataframe containing an overview of the plotRows
         """
-        overview_df = pd.DataFrame(
-            columns=[C.X, C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID,
-                     C.X_LABEL, C.OBSERVABLE_ID, C.SIMULATION_CONDITION_ID])
+        overview_df = utils.empty_overview_df(
+            [C.X, C.Y, C.NAME, C.IS_SIMULATION, C.DATASET_ID,
+             C.X_LABEL, C.OBSERVABLE_ID, C.SIMULATION_CONDITION_ID])
         if self.visualization_df is not None and \
                 ptc.DATASET_ID in self.visualization_df.columns:
             dfs = [p_row.get_data_df() for p_row in
@@ -108,22 +104,45 @@ class VisSpecPlot(plot_class.PlotClass):
                 overview_df = pd.concat(dfs, ignore_index=True)
         return overview_df
 
-    def generate_plot_rows(self, df):
+    def generate_plot_rows(self, df, is_simulation: bool = False):
         """
         Create a PlotRow object for each row of the visualization df
 
         Arguments:
             df: Measurement or Simulation df
+            is_simulation: True if df is a simulation df
         """
         plot_rows = []
-        if self.visualization_df is not None:
-            for _, plot_spec in self.visualization_df.iterrows():
-                if df is not None:
-                    plot_line = plot_row.PlotRow(df, plot_spec,
-                                                 self.condition_df)
-                    plot_rows.append(plot_line)
+        # without a df (e.g. no simulation file) there is nothing to plot
+        if self.visualization_df is not None and df is not None:
+            # reduce the condition df only once for all rows of the plot
+            condition_df = self.get_plot_condition_df(df)
+            condition_positions = utils.get_condition_positions(condition_df)
+            for plot_spec in self.visualization_df.itertuples(
+                    index=False):
+                plot_line = plot_row.PlotRow(df, plot_spec, condition_df,
+                                             is_simulation,
+                                             condition_positions)
+                plot_rows.append(plot_line)
         return plot_rows
 
+    def has_sorted_x_data(self):
+        """
+        Check whether the x-values of all lines are sorted in
+        increasing order (the measurement tables need not be
+        sorted by time).
+
+        Returns:
+            True if the x-values of every line are non-decreasing
+        """
+        for dot_line in self.dotted_lines + self.dotted_simulation_lines:
+            for line in dot_line.lines:
+                x_data = line.xData
+                if x_data is not None and \
+                        not np.all(np.diff(x_data) >= 0):
+                    return False
+        return True
+
     def generate_dotted_lines(self, plot_rows, is_simulation: bool = False):
         """
         Generate a list of DottedLines based on
@@ -137,14 +156,17 @@ class VisSpecPlot(plot_class.PlotClass):
             dotted_lines: A list of DottedLines.
         """
         dotted_lines = []  # list of PlotDataItems
+        # bind the lookups used for every row only once
+        disabled_rows = self.disabled_rows
+        plot_row_to_dotted_line = self.plot_row_to_dotted_line
         for line in plot_rows:
             if line.dataset_id == "":
                 plot_lines = self.default_plot(line,
                                                is_simulation=is_simulation)
                 dotted_lines += plot_lines
             else:
-                if line.dataset_id not in self.disabled_rows:
-                    dotted_lines.append(self.plot_row_to_dotted_line(line))
+                if line.dataset_id not in disabled_rows:
+                    dotted_lines.append(plot_row_to_dotted_line(line))
         return dotted_lines
 
     def generate_plot(self):
@@ -167,6 +189,12 @@ class VisSpecPlot(plot_class.PlotClass):
                 self.dotted_simulation_lines = \
                     self.default_plot(None, is_simulation=True)
 
+        # only draw the visible part of the lines, clipping
+        # searches the visible range and needs sorted x-values
+        # (no downsampling: every line draws its measurements as
+        # symbols, which have to stay at the measured points)
+        self.plot.setClipToView(self.has_sorted_x_data())
+
         add_error_bars = True
         # Errorbars do not support log scales
         if self.plot_rows and \
@@ -178,15 +206,16 @@ class VisSpecPlot(plot_class.PlotClass):
             add_error_bars = False
 
         num_lines = len(self.dotted_lines)
-        color_lookup = self.color_map.getLookupTable(nPts=num_lines)
+        color_lookup = self.get_color_lookup(num_lines)
+        plot = self.plot
+        simulation_lines = self.dotted_simulation_lines
         for i, dot_line in enumerate(self.dotted_lines):
             color = color_lookup[i]
-            dot_line.add_to_plot(self.plot, color,
-                                 add_error_bars=add_error_bars)
-            if self.dotted_simulation_lines:
-                self.dotted_simulation_lines[i]\
-                    .add_to_plot(self.plot, color,
+            dot_line.add_to_plot(plot, color,
                                  add_error_bars=add_error_bars)
+            if simulation_lines:
+                simulation_lines[i].add_to_plot(
+                    plot, color, add_error_bars=add_error_bars)
 
         self.set_scales()
         return self.plot
@@ -240,41 +269,44 @@ class VisSpecPlot(plot_class.PlotClass):
             y_var = ptc.SIMULATION
             symbol = "t"
 
-        beam_width = (np.max(df[ptc.TIME]) - np.min(df[ptc.TIME])) / 100
-
-        for group_id in np.unique(df[grouping]):
-            line_data = df[df[grouping] == group_id]
-            data = line_data[[y_var, ptc.TIME]]
-            x_data = data.groupby(ptc.TIME)
-            x_data = np.fromiter(x_data.groups.keys(), dtype=float)
-            y_data = utils.mean_replicates(line_data, ptc.TIME, y_var)
+        beam_width = np.ptp(df[ptc.TIME].to_numpy()) / 100
+        observable_id = df[ptc.OBSERVABLE_ID].iat[0]
+        symbol_pen = pg.mkPen("k")  # shared by the symbols of all lines
+
+        line_dfs = []  # concatenated once after the loop
+        # partition the df once (groups sorted by id, as with np.unique)
+        for group_id, line_data in df.groupby(grouping):
+            # the time points and the statistics come from one grouping
+            replicate_stats = utils.agg_replicates(line_data, ptc.TIME,
+                                                   y_var)
+            x_data = replicate_stats["groups"].astype(float)
+            y_data = replicate_stats["mean"]
             line_name = group_id
 
             # case distinction if a visualization_df was provided or not
             if p_row is not None:
-                # add offsets to the data:
-                x_data = x_data + p_row.x_offset
-                y_data = y_data + p_row.y_offset
+                # add offsets to the data (in place, both arrays
+                # are freshly computed for this line)
+                x_data += p_row.x_offset
+                y_data += p_row.y_offset
             else:
-                line_name = line_name + "_" + df[ptc.OBSERVABLE_ID].iloc[0]
+                line_name = line_name + "_" + observable_id
             # create overview_df for adding points
             if is_simulation:
                 line_name = line_name + " simulation"
-            line_df = pd.DataFrame(
-                {C.X: x_data.tolist(), C.Y: y_data.tolist(),
+            line_dfs.append(pd.DataFrame(
+                {C.X: x_data, C.Y: y_data,
                  C.NAME: group_id, C.IS_SIMULATION: is_simulation,
-                 "grouping_ids": group_id})
-            self.overview_df = self.overview_df.append(line_df,
-                                                       ignore_index=True)
+                 "grouping_ids": group_id}))
 
             # add error bars
-            sd = utils.sd_replicates(line_data, ptc.TIME, is_simulation)
+            sd = replicate_stats["sd"]
             error = pg.ErrorBarItem(x=x_data, y=y_data,
                                     top=sd, bottom=sd,
                                     beam=beam_width)
 
             lines = [pg.PlotDataItem(x_data, y_data, name=line_name,
-                                     symbolPen=pg.mkPen("k"),
+                                     symbolPen=symbol_pen,
                                      symbol=symbol,
                                      symbolSize=7)]
 
@@ -284,6 +316,9 @@ class VisSpecPlot(plot_class.PlotClass):
                                 group_id, is_simulation)
             plot_lines.append(dot_line)
 
+        if line_dfs:
+            self.overview_df = pd.concat([self.overview_df] + line_dfs,
+                                         ignore_index=True)
         return plot_lines
 
     def set_scales(self):
@@ -313,53 +348,58 @@ class VisSpecPlot(plot_class.PlotClass):
         The offset is calculated as the smallest nonzero value times 0.001
         (Also adds the offset to the simulation values).
         """
-        x_var = utils.get_x_var(self.visualization_df.iloc[0])
+        first_spec = next(self.visualization_df.itertuples(index=False))
+        x_var = utils.get_x_var(first_spec)
         y_var = ptc.MEASUREMENT
         if x_var == ptc.TIME:
-            x_values = np.asarray(self.measurement_df[x_var])
+            x_values = self.measurement_df[x_var].to_numpy(copy=False)
         else:
             # for concentration plots, each line can have a
             # different x_var
-            x_values = []
-            for variable in self.visualization_df[ptc.X_VALUES]:
-                x_values = x_values + list(self.condition_df[variable])
-            x_values = np.asarray(x_values)
-
-        y_values = np.asarray(self.measurement_df[y_var])
-
-        if ptc.X_SCALE in self.visualization_df.columns:
-            if 0 in x_values and "log" in self.visualization_df.iloc[0][
-                    ptc.X_SCALE]:
-                offset = np.min(x_values[np.nonzero(x_values)]) * 0.001
-                if x_var == ptc.TIME:
-                    x_values = x_values + offset
-                    self.measurement_df[x_var] = x_values
-                else:
-                    for variable in self.visualization_df[ptc.X_VALUES]:
-                        self.condition_df[variable] = np.asarray(
-                            self.condition_df[variable]) + offset
-                self.add_warning(
-                    "Unable to take log of 0, added offset of " + str(
-                        offset) + " to x-values")
-
-                if self.simulation_df is not None:
-                    x_simulation = np.asarray(self.simulation_df[x_var])
-                    self.simulation_df[x_var] = x_simulation + offset
-
-        if ptc.Y_SCALE in self.visualization_df.columns:
-            if 0 in y_values and "log" in self.visualization_df.iloc[0][
-                    ptc.Y_SCALE]:
-                offset = np.min(y_values[np.nonzero(y_values)]) * 0.001
-                y_values = y_values + offset
-                self.measurement_df[y_var] = y_values
-                self.add_warning(
-                    "Unable to take log of 0, added offset of " + str(
-                        offset) + " to y-values")
-
-                if self.simulation_df is not None:
-                    y_simulation = np.asarray(
-                        self.simulation_df[ptc.SIMULATION])
-                    self.simulation_df[ptc.SIMULATION] = y_simulation + offset
+            x_vars = list(pd.unique(self.visualization_df[ptc.X_VALUES]))
+            x_values = self.condition_df[x_vars].to_numpy(copy=False).ravel()
+
+        y_values = self.measurement_df[y_var].to_numpy(copy=False)
+
+        # check the scale first, the values only matter for log scales
+        x_offset = 0
+        if "log" in utils.get_x_scale(first_spec) and \
+                (x_values == 0).any():
+            x_offset = np.min(x_values[x_values != 0]) * 0.001
+        y_offset = 0
+        if "log" in utils.get_y_scale(first_spec) and \
+                (y_values == 0).any():
+            y_offset = np.min(y_values[y_values != 0]) * 0.001
+
+        # the dfs are shared by all plots, so the offsets are added
+        # to copies, which only this plot uses
+        if (x_offset and x_var == ptc.TIME) or y_offset:
+            self.measurement_df = self.measurement_df.copy()
+        if (x_offset or y_offset) and self.simulation_df is not None:
+            self.simulation_df = self.simulation_df.copy()
+
+        if x_offset:
+            if x_var == ptc.TIME:
+                self.measurement_df[x_var] += x_offset
+            else:
+                # each x_var only once, also if it is used by several lines
+                self.condition_df = self.condition_df.copy()
+                self.condition_df[x_vars] += x_offset
+            self.add_warning(
+                "Unable to take log of 0, added offset of " + str(
+                    x_offset) + " to x-values")
+
+            if self.simulation_df is not None:
+                self.simulation_df[x_var] += x_offset
+
+        if y_offset:
+            self.measurement_df[y_var] += y_offset
+            self.add_warning(
+                "Unable to take log of 0, added offset of " + str(
+                    y_offset) + " to y-values")
+
+            if self.simulation_df is not None:
+                self.simulation_df[ptc.SIMULATION] += y_offset
 
     def set_color_map(self, color_map):
         """
@@ -367,8 +407,7 @@ class VisSpecPlot(plot_class.PlotClass):
         of the lines accordingly.
         """
         super().set_color_map(color_map)
-        color_lookup = self.color_map.getLookupTable(
-            nPts=len(self.dotted_lines))
+        color_lookup = self.get_color_lookup(len(self.dotted_lines))
         for i in range(len(self.dotted_lines)):
             self.dotted_lines[i].set_color(color_lookup[i])
             if self.dotted_simulation_lines: